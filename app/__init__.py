@@ -3,6 +3,8 @@
 import os
 import sys
 import gc
+import struct
+import micropython
 
 APP_DIR = "/".join(__file__.replace("\\", "/").split("/")[:-1]) or "."
 os.chdir(APP_DIR)
@@ -15,36 +17,78 @@ try:
 except Exception:
     pass  # HIRES may not be available on all firmware versions
 
+# Pens are created once; color.rgb() allocates a new object on every call
+PEN_BLACK = color.rgb(0, 0, 0)
+PEN_WHITE = color.rgb(255, 255, 255)
+PEN_DIM = color.rgb(120, 120, 120)
+PEN_BG = color.rgb(0, 0, 0, 200)
+ORIGIN = vec2(0, 0)
+
 MEDIA_DIR = "media"
+RAW_EXT = ".bin"  # raw RGB565 framebuffers written by scripts/prepack_media.py
+DELTA_EXT = ".dlt"  # changed-byte runs against the previous raw frame
+RAW_SUPPORTED = hasattr(image, "from_buffer")
 OVERLAY_TICKS = 90  # frames to show overlay (~1.5s at ~60fps)
+OVERLAY_W = 160
+RESCAN_TICKS = 120  # frames B must be held to rescan media (~2s at ~60fps)
+TICK_MS = 16  # approximate duration of one frame at ~60fps
+DEFAULT_DELAY_MS = 100  # animation frame delay when meta.txt has none
 
 # State
 playlists = []
 playlist_idx = 0
 items = []
 item_idx = 0
+item_cache = {}  # playlist name -> sorted item list, built at init/rescan
 
 # Animation state
 anim_frame = 0
 anim_count = 0
 anim_tick = 0
+anim_delay = 1  # frames each animation frame stays on screen
 paused = False
+frame_paths = None  # precomputed frame file paths for the current animation
+anim_buf = None  # RGB565 back buffer that delta frames are patched into
 
 # Overlay state
 overlay_ticks_left = 0
+overlay_img = None  # pre-rendered overlay, rebuilt on each playlist switch
+overlay_rows = ()  # (pen, text, y offset) per line, laid out on playlist switch
+overlay_h = 0
+overlay_y = 0
+overlay_pos = None
+
+# Button state
+hold_ticks = 0
 
 # Display state
 current_img = None
+next_img = None  # decoded ahead of time while the current frame is shown
+next_frame_idx = -1
+needs_clear = True  # False while current_img covers the whole screen
 
 
 def listdir_safe(path):
-    """List directory contents, returning empty list on error."""
+    """List (name, is_dir) pairs for a directory, returning empty list on error.
+
+    Uses os.ilistdir() so the entry type comes from the directory read itself
+    instead of a separate stat per entry.
+    """
     try:
-        return os.listdir(path)
+        return [(e[0], (e[1] & 0x4000) != 0) for e in os.ilistdir(path)]
     except OSError:
         return []
 
 
+def exists(path):
+    """Check if a path exists."""
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
 def is_dir(path):
     """Check if path is a directory."""
     try:
@@ -53,67 +97,112 @@ def is_dir(path):
         return False
 
 
-def ensure_playlists():
-    """If media dir has loose files but no subdirectories, move them into 'default'."""
-    entries = listdir_safe(MEDIA_DIR)
-    has_dirs = False
+def is_png(name):
+    """Check for a .png/.PNG suffix without allocating a lowercased copy."""
+    return name.endswith(".png") or name.endswith(".PNG")
+
+
+def get_playlists():
+    """Return sorted list of playlist directory names.
+
+    If the media dir has loose files but no subdirectories, they are first
+    moved into a 'default' playlist. A single directory read serves both.
+    """
+    dirs = []
     loose_files = []
 
-    for e in entries:
-        full = MEDIA_DIR + "/" + e
+    for e, e_is_dir in listdir_safe(MEDIA_DIR):
         if e.startswith("."):
             continue
-        if is_dir(full):
-            has_dirs = True
+        if e_is_dir:
+            dirs.append(e)
         else:
             loose_files.append(e)
 
-    if not has_dirs and loose_files:
-        default_dir = MEDIA_DIR + "/default"
+    if not dirs and loose_files:
+        prefix = MEDIA_DIR + "/"
+        default_prefix = prefix + "default/"
         try:
-            os.mkdir(default_dir)
+            os.mkdir(prefix + "default")
         except OSError:
             pass
         for f in loose_files:
-            os.rename(MEDIA_DIR + "/" + f, default_dir + "/" + f)
+            os.rename(prefix + f, default_prefix + f)
+        dirs.append("default")
 
-
-def get_playlists():
-    """Return sorted list of playlist directory names."""
-    return [
-        e for e in sorted(listdir_safe(MEDIA_DIR))
-        if is_dir(MEDIA_DIR + "/" + e) and not e.startswith(".")
-    ]
+    dirs.sort()
+    return dirs
 
 
 def get_items(playlist):
     """Return sorted list of media items (filenames or animation dir names)."""
     pdir = MEDIA_DIR + "/" + playlist
+    entries = listdir_safe(pdir)
+    raw_stems = set()
+    if RAW_SUPPORTED:
+        raw_stems = {
+            e[:-len(RAW_EXT)] for e, e_is_dir in entries
+            if not e_is_dir and e.endswith(RAW_EXT)
+        }
+
     result = []
-    for e in sorted(listdir_safe(pdir)):
+    for e, e_is_dir in entries:
         if e.startswith(".") or e == "meta.txt":
             continue
-        full = pdir + "/" + e
-        if is_dir(full) or e.lower().endswith(".png"):
+        if e_is_dir:
             result.append(e)
+        elif is_png(e):
+            # A prepacked .bin replaces its PNG when the firmware can load it
+            if e[:-4] in raw_stems:
+                result.append(e[:-4] + RAW_EXT)
+            else:
+                result.append(e)
+    result.sort()
     return result
 
 
-def get_frame_count(anim_dir):
-    """Get frame count from an animation directory's meta.txt or by counting files."""
+def read_meta(anim_dir):
+    """Parse an animation directory's meta.txt into a dict, read in one call."""
     try:
         with open(anim_dir + "/meta.txt", "r") as f:
-            for line in f:
-                if line.startswith("frame_count="):
-                    return int(line.strip().split("=")[1])
+            data = f.read()
     except OSError:
+        return {}
+    meta = {}
+    for line in data.split("\n"):
+        if "=" in line:
+            key, value = line.split("=", 1)
+            meta[key.strip()] = value.strip()
+    return meta
+
+
+def get_frame_ext(meta):
+    """Get the frame file extension from parsed meta.txt (.png or .jpg)."""
+    return "." + meta.get("frame_format", "png")
+
+
+def get_frame_count(anim_dir, meta):
+    """Get frame count from parsed meta.txt or by counting files."""
+    try:
+        return int(meta["frame_count"])
+    except (KeyError, ValueError):
         pass
+    ext = get_frame_ext(meta)
     return len([
-        f for f in listdir_safe(anim_dir)
-        if f.startswith("frame_") and f.endswith(".png")
+        f for f, f_is_dir in listdir_safe(anim_dir)
+        if not f_is_dir and f.startswith("frame_") and f.endswith(ext)
     ])
 
 
+def get_frame_delay(meta):
+    """Convert meta.txt's delay_ms into a number of update() frames."""
+    try:
+        delay_ms = int(meta["delay_ms"])
+    except (KeyError, ValueError):
+        delay_ms = DEFAULT_DELAY_MS
+    return max(delay_ms // TICK_MS, 1)
+
+
 def current_path():
     """Get the full path of the current media item."""
     if not items:
@@ -126,29 +215,148 @@ def is_animation(path):
     return path is not None and is_dir(path)
 
 
+def covers_screen(img):
+    """Check if an image fills the whole screen, making a clear redundant."""
+    return (
+        img is not None
+        and img.width >= screen.width
+        and img.height >= screen.height
+    )
+
+
+def load_raw(path):
+    """Load a prepacked RGB565 .bin file as a screen-sized image.
+
+    Falls back to the PNG it was packed from if the firmware's from_buffer()
+    rejects the buffer, so a mismatched firmware still shows the image.
+    """
+    try:
+        with open(path, "rb") as f:
+            return image.from_buffer(f.read(), screen.width, screen.height)
+    except MemoryError:
+        raise  # decode() collects and retries
+    except Exception as e:
+        print("Raw load failed, using PNG:", path, e)
+        return image.load(path[:-len(RAW_EXT)] + ".png")
+
+
+def decode(path):
+    """Load an image, collecting garbage only if the heap is too fragmented."""
+    loader = load_raw if path.endswith(RAW_EXT) else image.load
+    try:
+        return loader(path)
+    except MemoryError:
+        gc.collect()
+        try:
+            return loader(path)
+        except Exception as e:
+            print("Error loading:", path, e)
+    except Exception as e:
+        print("Error loading:", path, e)
+    return None
+
+
 def load_image(path):
     """Load an image, freeing the previous one first."""
-    global current_img
+    global current_img, needs_clear
     current_img = None
-    gc.collect()
+    current_img = decode(path)
+    needs_clear = not covers_screen(current_img)
+
+
+@micropython.native
+def apply_delta(buf, data):
+    """Patch buf in place with the (offset, length, bytes) runs of a delta frame."""
+    mv = memoryview(data)
+    i = 0
+    n = len(data)
+    while i < n:
+        off, length = struct.unpack_from("<II", data, i)
+        i += 8
+        buf[off:off + length] = mv[i:i + length]
+        i += length
+
+
+def use_source_frames():
+    """Switch the current animation from prepacked frames to its PNG/JPEG frames."""
+    global frame_paths, anim_buf
+    path = frame_paths[0]
+    ext = get_frame_ext(read_meta(path[:path.rindex("/")]))
+    frame_paths = [p[:p.rindex(".")] + ext for p in frame_paths]
+    anim_buf = None
+
+
+def load_frame(idx):
+    """Show animation frame idx, patching the back buffer for delta animations."""
+    global current_img, needs_clear
+    if anim_buf is None:
+        load_image(frame_paths[idx])
+        return
     try:
-        current_img = image.load(path)
+        with open(frame_paths[idx], "rb") as f:
+            if idx == 0:
+                f.readinto(anim_buf)
+            else:
+                apply_delta(anim_buf, f.read())
     except Exception as e:
-        current_img = None
-        print("Error loading:", path, e)
+        print("Error loading:", frame_paths[idx], e)
+    else:
+        try:
+            current_img = image.from_buffer(anim_buf, screen.width, screen.height)
+        except Exception as e:
+            # The firmware's from_buffer() does not take this layout; the
+            # source frames are still on disk, so play those instead
+            print("Raw load failed, using source frames:", frame_paths[idx], e)
+            use_source_frames()
+            load_image(frame_paths[idx])
+            return
+    needs_clear = not covers_screen(current_img)
+
+
+def preload_next():
+    """Decode the upcoming animation frame into next_img."""
+    global next_img, next_frame_idx
+    next_frame_idx = (anim_frame + 1) % len(frame_paths)
+    next_img = decode(frame_paths[next_frame_idx])
 
 
 def load_item():
     """Load the current media item."""
-    global anim_frame, anim_count, anim_tick, paused
+    global anim_frame, anim_count, anim_tick, anim_delay, paused
+    global frame_paths, anim_buf
+    global current_img, next_img
     path = current_path()
     anim_frame = 0
     anim_tick = 0
     paused = False
+    frame_paths = None
+    anim_buf = None
+    next_img = None
+
+    # Switching items is the one place a full collection is worth its pause:
+    # the previous item's images are garbage and the new one may be larger
+    current_img = None
+    gc.collect()
 
     if path and is_animation(path):
-        anim_count = get_frame_count(path)
-        load_image(path + "/frame_000.png")
+        meta = read_meta(path)
+        anim_count = get_frame_count(path, meta)
+        anim_delay = get_frame_delay(meta)
+        prefix = path + "/frame_"
+        delta = RAW_SUPPORTED and exists(prefix + "001" + DELTA_EXT)
+        ext = get_frame_ext(meta)
+        if delta:
+            ext = DELTA_EXT
+        elif RAW_SUPPORTED and exists(prefix + "000" + RAW_EXT):
+            ext = RAW_EXT
+        # %-formatting is handled natively; str.format() re-parses its spec
+        frame_paths = [
+            "%s%03d%s" % (prefix, i, ext) for i in range(max(anim_count, 1))
+        ]
+        if delta:
+            frame_paths[0] = prefix + "000" + RAW_EXT
+            anim_buf = bytearray(screen.width * screen.height * 2)
+        load_frame(0)
     elif path:
         anim_count = 0
         load_image(path)
@@ -158,123 +366,211 @@ def switch_playlist(new_idx):
     """Switch to a different playlist by index."""
     global playlist_idx, items, item_idx, overlay_ticks_left
     playlist_idx = new_idx
-    items = get_items(playlists[playlist_idx])
+    items = item_cache[playlists[playlist_idx]]
     item_idx = 0
     overlay_ticks_left = OVERLAY_TICKS
+    build_overlay()
     load_item()
 
 
-def draw_overlay():
-    """Draw playlist name overlay in bottom-left with faded prev/next names."""
+def layout_overlay():
+    """Lay out the overlay box and its text rows for the current playlist."""
+    global overlay_h, overlay_y, overlay_pos, overlay_rows
     n = len(playlists)
-    if n == 0:
-        return
-
     current_name = playlists[playlist_idx]
 
+    if n > 1:
+        overlay_h = 48
+        overlay_rows = (
+            (PEN_DIM, playlists[(playlist_idx - 1) % n], 4),
+            (PEN_WHITE, "> " + current_name, 18),
+            (PEN_DIM, playlists[(playlist_idx + 1) % n], 32),
+        )
+    else:
+        overlay_h = 20
+        overlay_rows = ((PEN_WHITE, current_name, 4),)
+
+    overlay_y = screen.height - overlay_h
+    overlay_pos = vec2(0, overlay_y)
+
+
+def render_overlay(target, box_y):
+    """Draw the playlist overlay box onto target with its top edge at box_y."""
     # Background box
-    box_w = 160
-    box_h = 48 if n > 1 else 20
-    box_y = screen.height - box_h
+    target.pen = PEN_BG
+    target.rectangle(0, box_y, OVERLAY_W, overlay_h)
 
-    screen.pen = color.rgb(0, 0, 0, 200)
-    screen.rectangle(0, box_y, box_w, box_h)
+    for pen, text, dy in overlay_rows:
+        target.pen = pen
+        target.text(text, 6, box_y + dy)
 
-    x = 6
-    if n > 1:
-        prev_name = playlists[(playlist_idx - 1) % n]
-        next_name = playlists[(playlist_idx + 1) % n]
 
-        screen.pen = color.rgb(120, 120, 120)
-        screen.text(prev_name, x, box_y + 4)
+def build_overlay():
+    """Pre-render the overlay offscreen so each frame it is shown costs one blit."""
+    global overlay_img
+    overlay_img = None
+    if not playlists:
+        return
+    layout_overlay()
+    try:
+        sprite = image(OVERLAY_W, overlay_h)
+        sprite.font = screen.font
+        render_overlay(sprite, 0)
+        overlay_img = sprite
+    except Exception:
+        pass  # offscreen images may not be available; draw_overlay falls back
 
-        screen.pen = color.rgb(255, 255, 255)
-        screen.text("> " + current_name, x, box_y + 18)
 
-        screen.pen = color.rgb(120, 120, 120)
-        screen.text(next_name, x, box_y + 32)
-    else:
-        screen.pen = color.rgb(255, 255, 255)
-        screen.text(current_name, x, box_y + 4)
+def draw_overlay():
+    """Draw playlist name overlay in bottom-left with faded prev/next names."""
+    if overlay_img:
+        screen.blit(overlay_img, overlay_pos)
+    elif overlay_rows:
+        render_overlay(screen, overlay_y)
 
 
 def show_no_media():
     """Show a message when no media is found."""
-    screen.pen = color.rgb(0, 0, 0)
+    screen.pen = PEN_BLACK
     screen.clear()
-    screen.pen = color.rgb(255, 255, 255)
+    screen.pen = PEN_WHITE
     screen.text("No media found", 60, 100)
     screen.text("Add images to media/", 40, 130)
 
 
+def build_item_cache():
+    """Scan every playlist once and cache its sorted item list."""
+    item_cache.clear()
+    for p in playlists:
+        item_cache[p] = get_items(p)
+
+
 def init():
     """Initialize playlists and load first item."""
     global playlists, items, overlay_ticks_left
 
-    ensure_playlists()
     playlists = get_playlists()
 
     if not playlists:
         return
 
-    items = get_items(playlists[playlist_idx])
+    build_item_cache()
+    items = item_cache[playlists[playlist_idx]]
     if items:
         load_item()
         overlay_ticks_left = OVERLAY_TICKS
+        build_overlay()
 
 
-def update():
-    """Main update loop called by Badgeware framework each frame."""
-    global item_idx, anim_frame, anim_tick, paused
-    global overlay_ticks_left
+def rescan():
+    """Re-read the media directory, keeping the current playlist if it still exists."""
+    global playlists, items, item_idx, playlist_idx
+
+    current = playlists[playlist_idx] if playlists else None
+    playlists = get_playlists()
+    build_item_cache()
 
     if not playlists:
-        show_no_media()
+        items = []
+        item_idx = 0
         return
 
-    # Button handling
-    if io.BUTTON_A in io.pressed and items:
-        item_idx = (item_idx - 1) % len(items)
-        load_item()
-
-    if io.BUTTON_C in io.pressed and items:
-        item_idx = (item_idx + 1) % len(items)
-        load_item()
-
-    if io.BUTTON_B in io.pressed:
-        path = current_path()
-        if path and is_animation(path):
-            paused = not paused
+    if current in playlists:
+        switch_playlist(playlists.index(current))
+    else:
+        switch_playlist(0)
 
-    if io.BUTTON_UP in io.pressed:
-        switch_playlist((playlist_idx - 1) % len(playlists))
 
-    if io.BUTTON_DOWN in io.pressed:
-        switch_playlist((playlist_idx + 1) % len(playlists))
+def render():
+    """Draw the current state; called exactly once at the end of update().
 
-    # Advance animation frame
-    path = current_path()
-    if path and is_animation(path) and not paused:
-        anim_tick += 1
-        if anim_tick >= 1:
-            anim_tick = 0
-            anim_frame = (anim_frame + 1) % max(anim_count, 1)
-            load_image(path + "/frame_{:03d}.png".format(anim_frame))
+    Must draw every frame as the framework clears between updates, but a
+    full-screen image overwrites every pixel so the clear can be skipped.
+    """
+    global overlay_ticks_left, overlay_img
 
-    # Render - must draw every frame as the framework clears between updates
-    if path is None:
+    if not items:
         show_no_media()
         return
 
-    screen.pen = color.rgb(0, 0, 0)
-    screen.clear()
+    scr = screen
+    if needs_clear:
+        scr.pen = PEN_BLACK
+        scr.clear()
 
-    if current_img:
-        screen.blit(current_img, vec2(0, 0))
+    img = current_img
+    if img:
+        scr.blit(img, ORIGIN)
 
     if overlay_ticks_left > 0:
         draw_overlay()
         overlay_ticks_left -= 1
+        if overlay_ticks_left == 0:
+            overlay_img = None
+
+
+def update():
+    """Main update loop called by Badgeware framework each frame."""
+    global item_idx, anim_frame, anim_tick, paused, hold_ticks
+    global current_img, next_img, needs_clear
+
+    # Holding B rescans the media directory for newly copied files
+    if io.BUTTON_B in io.held:
+        hold_ticks += 1
+        if hold_ticks == RESCAN_TICKS:
+            rescan()
+    else:
+        hold_ticks = 0
+
+    if not playlists:
+        render()
+        return
+
+    # Button handling - io.pressed is fetched once and skipped when empty,
+    # which is nearly every frame
+    pressed = io.pressed
+    if pressed:
+        if io.BUTTON_A in pressed and items:
+            item_idx = (item_idx - 1) % len(items)
+            load_item()
+
+        if io.BUTTON_C in pressed and items:
+            item_idx = (item_idx + 1) % len(items)
+            load_item()
+
+        if io.BUTTON_B in pressed and frame_paths:
+            paused = not paused
+
+        if io.BUTTON_UP in pressed:
+            switch_playlist((playlist_idx - 1) % len(playlists))
+
+        if io.BUTTON_DOWN in pressed:
+            switch_playlist((playlist_idx + 1) % len(playlists))
+
+    # Advance animation frame - frame_paths is read several times below, so
+    # it is bound to a local once (each global read is a dict lookup)
+    paths = frame_paths
+    if paths and not paused:
+        anim_tick += 1
+        if anim_tick >= anim_delay:
+            anim_tick = 0
+            anim_frame = (anim_frame + 1) % len(paths)
+            if next_img is not None and next_frame_idx == anim_frame:
+                current_img, next_img = next_img, None
+                needs_clear = not covers_screen(current_img)
+            else:
+                load_frame(anim_frame)
+
+    render()
+
+    # Decode the next frame on an idle tick between frame changes, so the
+    # tick that advances only has to swap. anim_tick is 0 on the tick that
+    # just swapped, and always 0 when anim_delay is 1, leaving no idle tick
+    # to preload on. Delta frames depend on the previous one so they are
+    # applied in order
+    if (paths and anim_tick and len(paths) > 1 and not paused
+            and next_img is None and anim_buf is None):
+        preload_next()
 
 
 run(update, init=init)
@@ -9,8 +9,14 @@ Files that are already badge-ready (320x240 PNGs) are left untouched.
 Animated GIFs and videos are extracted into numbered frame directories
 with a meta.txt file.
 
+Files are converted in parallel across all CPU cores; use --jobs to limit
+the number of worker processes.
+
+Animation frames are written as PNG by default; --frame-format jpg writes
+JPEG frames instead, which are much smaller and faster for the badge to read.
+
 Usage:
-    python convert_media.py [--media-dir DIR]
+    python convert_media.py [--media-dir DIR] [--jobs N] [--frame-format {png,jpg}]
 
 Examples:
     # Convert everything under app/media/
@@ -18,62 +24,154 @@ Examples:
 
     # Specify a custom media directory
     python convert_media.py --media-dir /path/to/media
+
+    # Store animation frames as JPEG
+    python convert_media.py --frame-format jpg
 """
 
 import argparse
+import io
 import json
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
-from pathlib import Path
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial
 
 try:
-    from PIL import Image
+    from PIL import Image, ImageOps, ImageSequence
 except ImportError:
     print("Error: Pillow is required. Install with: pip install Pillow")
     sys.exit(1)
 
+try:
+    import av
+except ImportError:
+    av = None  # optional: PyAV decodes video in-process instead of spawning ffmpeg
+
+EXIF_ORIENTATION = 0x0112
 DISPLAY_WIDTH = 320
 DISPLAY_HEIGHT = 240
 SUPPORTED_IMAGES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
 SUPPORTED_GIFS = {".gif"}
 SUPPORTED_VIDEOS = {".mp4", ".avi", ".mov", ".webm", ".mkv"}
 ALL_SUPPORTED = SUPPORTED_IMAGES | SUPPORTED_GIFS | SUPPORTED_VIDEOS
+FRAME_FORMATS = ("png", "jpg")
+JPEG_QUALITY = 85
+REDUCING_GAP = 3.0  # box-reduce first when shrinking by at least this factor
+GIF_BACKLOG = 32  # frames decoded ahead of the threads, bounding memory use
+
+thread_state = threading.local()
+
+
+def file_ext(path):
+    """Return the lowercased extension of a path, including the dot."""
+    return os.path.splitext(path)[1].lower()
 
 
-def unique_name(path):
-    """Return a unique path by appending _N if it already exists.
+def unique_name(path, is_dir=False):
+    """Claim a unique path by appending _N if it already exists.
 
-    Works for both files and directories.
+    The name is claimed by creating it (an empty file, or the directory
+    itself), which fails atomically if it exists, so parallel workers can
+    never be handed the same name.
     """
-    if not os.path.exists(path):
-        return path
     base, ext = os.path.splitext(path)
-    counter = 1
-    while os.path.exists(f"{base}_{counter}{ext}"):
-        counter += 1
-    return f"{base}_{counter}{ext}"
+    candidate = path
+    counter = 0
+    while True:
+        try:
+            if is_dir:
+                os.mkdir(candidate)
+            else:
+                os.close(os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+            return candidate
+        except FileExistsError:
+            counter += 1
+            candidate = f"{base}_{counter}{ext}"
+
+
+def resize(img, size):
+    """Resize with Lanczos, box-reducing large downscales first.
+
+    With reducing_gap, Pillow shrinks by an integer factor using a fast box
+    filter before the Lanczos pass, so a 1080p source is filtered at a few
+    times the target size instead of at full resolution.
+    """
+    return img.resize(size, Image.LANCZOS, reducing_gap=REDUCING_GAP)
+
 
+def letterbox(img, target_w, target_h, canvas=None):
+    """Resize image to fit within target dimensions, letterboxing with black.
 
-def letterbox(img, target_w, target_h):
-    """Resize image to fit within target dimensions, letterboxing with black."""
+    Pass a target-sized RGB canvas to reuse it instead of allocating a new
+    one; it is cleared to black and returned. Images that already have the
+    target aspect ratio are only resized, and the canvas is left untouched.
+    """
     img_w, img_h = img.size
-    scale = min(target_w / img_w, target_h / img_h)
-    new_w = int(img_w * scale)
-    new_h = int(img_h * scale)
-    resized = img.resize((new_w, new_h), Image.LANCZOS)
-    canvas = Image.new("RGB", (target_w, target_h), (0, 0, 0))
+    if (img_w, img_h) == (target_w, target_h):
+        return img
+
+    # Compare aspect ratios by cross-multiplying so the fit stays in integers
+    if img_w * target_h >= img_h * target_w:
+        new_w = target_w
+        new_h = max(target_w * img_h // img_w, 1)
+    else:
+        new_h = target_h
+        new_w = max(target_h * img_w // img_h, 1)
+
+    # Same aspect ratio (to within rounding): the bars would be at most one
+    # pixel wide, so skip the canvas entirely
+    if new_w >= target_w - 1 and new_h >= target_h - 1:
+        return resize(img, (target_w, target_h))
+
+    resized = resize(img, (new_w, new_h))
+    if canvas is None:
+        canvas = Image.new("RGB", (target_w, target_h), (0, 0, 0))
+    else:
+        canvas.paste((0, 0, 0), (0, 0, target_w, target_h))
     offset_x = (target_w - new_w) // 2
     offset_y = (target_h - new_h) // 2
     canvas.paste(resized, (offset_x, offset_y))
     return canvas
 
 
+def as_rgb(img):
+    """Return img in RGB mode, copying only if it is in another mode."""
+    return img if img.mode == "RGB" else img.convert("RGB")
+
+
 def save_png(img, path):
     """Save image as PNG."""
-    img.convert("RGB").save(path, "PNG")
+    as_rgb(img).save(path, "PNG")
+
+
+def save_jpeg(img, path):
+    """Save image as baseline JPEG.
+
+    optimize=True spends an extra encode pass on optimal Huffman tables for
+    files a few percent smaller, a one-off cost that the badge pays back in
+    flash reads on every playback. Baseline 4:2:0 is the cheapest layout for
+    the badge to decode.
+    """
+    as_rgb(img).save(
+        path, "JPEG", quality=JPEG_QUALITY, optimize=True,
+        progressive=False, subsampling="4:2:0"
+    )
+
+
+def save_frame(img, frame_dir, index, frame_format):
+    """Save an animation frame as frame_NNN.<frame_format>."""
+    path = os.path.join(frame_dir, f"frame_{index:03d}.{frame_format}")
+    if frame_format == "jpg":
+        save_jpeg(img, path)
+    else:
+        save_png(img, path)
 
 
 def is_badge_ready_png(path):
@@ -87,23 +185,44 @@ def is_badge_ready_png(path):
 
 def is_converted_anim_dir(path):
     """Check if a directory is an already-converted animation (has meta.txt and frame files)."""
-    if not os.path.isdir(path):
-        return False
-    contents = os.listdir(path)
-    has_meta = "meta.txt" in contents
-    has_frames = any(f.startswith("frame_") and f.endswith(".png") for f in contents)
-    return has_meta and has_frames
+    has_meta = has_frames = False
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                if name == "meta.txt":
+                    has_meta = True
+                elif name.startswith("frame_") and name.rpartition(".")[2] in FRAME_FORMATS:
+                    has_frames = True
+                if has_meta and has_frames:
+                    return True
+    except OSError:
+        pass
+    return False
 
 
-def write_meta(frame_dir, frame_count, delay_ms):
+def write_meta(frame_dir, frame_count, delay_ms, frame_format):
     """Write a meta.txt file for an animation directory."""
     with open(os.path.join(frame_dir, "meta.txt"), "w") as f:
         f.write(f"frame_count={frame_count}\n")
         f.write(f"delay_ms={delay_ms}\n")
+        f.write(f"frame_format={frame_format}\n")
 
 
 def get_video_fps(input_path):
-    """Get the FPS of a video file using ffprobe. Returns 10 on failure."""
+    """Get the FPS of a video file. Returns 10 on failure.
+
+    Reads the container header in-process with PyAV when it is installed,
+    otherwise spawns ffprobe.
+    """
+    if av is not None:
+        try:
+            with av.open(str(input_path)) as container:
+                rate = container.streams.video[0].average_rate
+                if rate:
+                    return float(rate)
+        except Exception:
+            pass
     try:
         result = subprocess.run(
             ["ffprobe", "-v", "quiet", "-print_format", "json",
@@ -121,20 +240,30 @@ def get_video_fps(input_path):
 
 def convert_static_image(input_path):
     """Convert a static image to 320x240 PNG in-place."""
-    ext = Path(input_path).suffix.lower()
+    ext = file_ext(input_path)
 
     if ext == ".png" and is_badge_ready_png(input_path):
         print(f"  Already ready: {input_path}")
         return
 
-    img = letterbox(Image.open(input_path), DISPLAY_WIDTH, DISPLAY_HEIGHT)
-    stem = Path(input_path).stem
-    parent = str(Path(input_path).parent)
+    src = Image.open(input_path)
+    # JPEGs can decode directly at 1/2, 1/4 or 1/8 scale; no-op for other formats
+    src.draft("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    # Phone photos are often stored sideways with an EXIF rotation flag
+    if src.getexif().get(EXIF_ORIENTATION, 1) != 1:
+        src = ImageOps.exif_transpose(src)
+    img = letterbox(src, DISPLAY_WIDTH, DISPLAY_HEIGHT)
+    parent, name = os.path.split(input_path)
+    stem = os.path.splitext(name)[0]
     out_path = os.path.join(parent, f"{stem}.png")
 
     if ext != ".png":
         out_path = unique_name(out_path)
-        save_png(img, out_path)
+        try:
+            save_png(img, out_path)
+        except BaseException:
+            os.remove(out_path)  # don't leave the claimed name as an empty file
+            raise
         os.remove(input_path)
         print(f"  Converted: {input_path} -> {out_path}")
     else:
@@ -142,8 +271,49 @@ def convert_static_image(input_path):
         print(f"  Re-encoded: {input_path}")
 
 
-def convert_gif(input_path):
-    """Convert an animated GIF to a directory of PNG frames + meta.txt, in-place."""
+def thread_canvas():
+    """Return this thread's reusable display-sized letterbox canvas."""
+    canvas = getattr(thread_state, "canvas", None)
+    if canvas is None:
+        canvas = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), (0, 0, 0))
+        thread_state.canvas = canvas
+    return canvas
+
+
+def write_gif_frame(index, rgb, frame_dir, frame_format):
+    """Letterbox and save one RGB GIF frame. Runs in a thread."""
+    frame = letterbox(rgb, DISPLAY_WIDTH, DISPLAY_HEIGHT, thread_canvas())
+    save_frame(frame, frame_dir, index, frame_format)
+
+
+def write_gif_frames(img, frame_dir, frame_format, threads):
+    """Decode every frame of an open GIF and save them into frame_dir."""
+    # Seeking has to be serial, but resizing and encoding release the GIL, so
+    # frames are finished across a thread pool while later ones are decoded
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # ImageSequence walks frames strictly in order, so each frame is
+        # decoded on top of the previous one's disposal state
+        for i, frame in enumerate(ImageSequence.Iterator(img)):
+            if len(pending) == GIF_BACKLOG:
+                pending.popleft().result()
+            # Frames must be copied out before the next seek. Pillow loads
+            # frames after the first as RGB already; only palette (and RGBA)
+            # frames need converting rather than a plain copy
+            rgb = frame.copy() if frame.mode == "RGB" else frame.convert("RGB")
+            pending.append(
+                executor.submit(write_gif_frame, i, rgb, frame_dir, frame_format)
+            )
+        for future in pending:
+            future.result()
+
+
+def convert_gif(input_path, frame_format="png", threads=1):
+    """Convert an animated GIF to a directory of PNG/JPEG frames + meta.txt, in-place.
+
+    threads is the number of threads that resize and encode frames while
+    the next ones are decoded.
+    """
     img = Image.open(input_path)
     n_frames = getattr(img, "n_frames", 1)
 
@@ -151,100 +321,210 @@ def convert_gif(input_path):
         convert_static_image(input_path)
         return
 
-    stem = Path(input_path).stem
-    parent = str(Path(input_path).parent)
-    frame_dir = unique_name(os.path.join(parent, stem))
-    os.makedirs(frame_dir)
-
+    parent, name = os.path.split(input_path)
+    stem = os.path.splitext(name)[0]
+    frame_dir = unique_name(os.path.join(parent, stem), is_dir=True)
     delay_ms = img.info.get("duration", 100) or 100
 
-    for i in range(n_frames):
-        img.seek(i)
-        frame = letterbox(img.convert("RGB"), DISPLAY_WIDTH, DISPLAY_HEIGHT)
-        save_png(frame, os.path.join(frame_dir, f"frame_{i:03d}.png"))
-
-    write_meta(frame_dir, n_frames, delay_ms)
+    try:
+        write_gif_frames(img, frame_dir, frame_format, threads)
+        write_meta(frame_dir, n_frames, delay_ms, frame_format)
+    except BaseException:
+        shutil.rmtree(frame_dir)  # don't leave a half-written animation behind
+        raise
 
     img.close()
     os.remove(input_path)
     print(f"  Converted GIF ({n_frames} frames): {input_path} -> {frame_dir}")
 
 
-def convert_video(input_path):
-    """Convert a video to a directory of PNG frames + meta.txt, in-place."""
-    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+def decode_video_av(input_path, frame_dir, target_fps, frame_format):
+    """Decode a video in-process with PyAV and save letterboxed frames.
+
+    Resamples to target_fps by keeping the first frame at or after each
+    output tick; ticks that pass with no frame at all hold the previous one.
+    Returns the number of frames written.
+    """
+    interval = 1 / target_fps
+    next_time = None
+    frame_count = 0
+    img = None
+    canvas = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), (0, 0, 0))
+
+    with av.open(str(input_path)) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"  # libav's frame/slice-threaded decoding
+        for packet_frame in container.decode(stream):
+            t = packet_frame.time
+            if t is None:
+                t = next_time or 0.0
+            if next_time is None:
+                next_time = t
+            if t + 1e-6 < next_time:
+                continue
+            # Across a timestamp gap or a slow variable-rate stretch, repeat
+            # the last frame as ffmpeg's fps filter does, so playback keeps
+            # the clip's real timing
+            while img is not None and next_time + interval <= t + 1e-6:
+                save_frame(img, frame_dir, frame_count, frame_format)
+                frame_count += 1
+                next_time += interval
+            next_time += interval
+            img = packet_frame.to_image()
+            # Phone videos are stored sideways with a display rotation, which
+            # the ffmpeg CLI applies but PyAV only reports
+            rotation = getattr(packet_frame, "rotation", 0)
+            if rotation:
+                img = img.rotate(rotation, expand=True)
+            img = letterbox(img, DISPLAY_WIDTH, DISPLAY_HEIGHT, canvas)
+            save_frame(img, frame_dir, frame_count, frame_format)
+            frame_count += 1
+
+    return frame_count
+
+
+def decode_video_ffmpeg(input_path, frame_dir, target_fps, frame_format):
+    """Decode a video with an ffmpeg subprocess and save its frames.
+
+    ffmpeg decodes, resamples and letterboxes; raw RGB frames come back over
+    a pipe and are encoded once here, with no intermediate files on disk.
+    Returns the number of frames written.
+    """
+    cmd = [
+        "ffmpeg", "-loglevel", "error", "-i", str(input_path), "-vf",
+        f"fps={target_fps},scale={DISPLAY_WIDTH}:{DISPLAY_HEIGHT}:"
+        f"force_original_aspect_ratio=decrease,"
+        f"pad={DISPLAY_WIDTH}:{DISPLAY_HEIGHT}:(ow-iw)/2:(oh-ih)/2:black",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1",
+    ]
+    frame_size = DISPLAY_WIDTH * DISPLAY_HEIGHT * 3
+    frame_count = 0
+
+    # stderr goes to a file: a pipe left unread while stdout is drained would
+    # fill on a noisy broken stream and deadlock both processes. stdin is
+    # closed so parallel ffmpegs don't compete for the terminal
+    with tempfile.TemporaryFile() as errors:
+        with subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=errors
+        ) as proc:
+            while True:
+                buf = proc.stdout.read(frame_size)
+                if len(buf) < frame_size:
+                    break
+                frame = Image.frombuffer(
+                    "RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), buf, "raw", "RGB", 0, 1
+                )
+                save_frame(frame, frame_dir, frame_count, frame_format)
+                frame_count += 1
+
+        if proc.returncode != 0:
+            errors.seek(0)
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=errors.read())
+
+    return frame_count
+
+
+def convert_video(input_path, frame_format="png"):
+    """Convert a video to a directory of PNG/JPEG frames + meta.txt, in-place.
+
+    Uses PyAV when it is installed, otherwise the ffmpeg and ffprobe tools.
+    """
+    if av is None and not (shutil.which("ffmpeg") and shutil.which("ffprobe")):
         print(f"  Error: ffmpeg/ffprobe not found. Skipping {input_path}")
         return
 
-    stem = Path(input_path).stem
-    parent = str(Path(input_path).parent)
-    frame_dir = unique_name(os.path.join(parent, stem))
-    os.makedirs(frame_dir)
+    parent, name = os.path.split(input_path)
+    stem = os.path.splitext(name)[0]
+    frame_dir = unique_name(os.path.join(parent, stem), is_dir=True)
 
     fps = get_video_fps(input_path)
     target_fps = min(fps, 15)
     delay_ms = int(1000 / target_fps)
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        subprocess.run(
-            ["ffmpeg", "-i", str(input_path), "-vf",
-             f"fps={target_fps},scale={DISPLAY_WIDTH}:{DISPLAY_HEIGHT}:"
-             f"force_original_aspect_ratio=decrease,"
-             f"pad={DISPLAY_WIDTH}:{DISPLAY_HEIGHT}:(ow-iw)/2:(oh-ih)/2:black",
-             os.path.join(tmpdir, "frame_%03d.png")],
-            capture_output=True, check=True
-        )
-
-        frames = sorted(f for f in os.listdir(tmpdir) if f.endswith(".png"))
-        for i, fname in enumerate(frames):
-            shutil.move(
-                os.path.join(tmpdir, fname),
-                os.path.join(frame_dir, f"frame_{i:03d}.png")
-            )
-
-    frame_count = len([x for x in os.listdir(frame_dir) if x.endswith(".png")])
-    write_meta(frame_dir, frame_count, delay_ms)
+    decode_video = decode_video_av if av is not None else decode_video_ffmpeg
+    try:
+        frame_count = decode_video(input_path, frame_dir, target_fps, frame_format)
+        write_meta(frame_dir, frame_count, delay_ms, frame_format)
+    except BaseException:
+        shutil.rmtree(frame_dir)  # don't leave a half-written animation behind
+        raise
 
     os.remove(input_path)
     print(f"  Converted video ({frame_count} frames @ {target_fps}fps): {input_path} -> {frame_dir}")
 
 
-def process_file(file_path):
+def process_file(file_path, frame_format="png", threads=1):
     """Route a single file to the appropriate converter."""
-    ext = Path(file_path).suffix.lower()
+    ext = file_ext(file_path)
     if ext in SUPPORTED_GIFS:
-        convert_gif(file_path)
+        convert_gif(file_path, frame_format, threads)
     elif ext in SUPPORTED_VIDEOS:
-        convert_video(file_path)
+        convert_video(file_path, frame_format)
     elif ext in SUPPORTED_IMAGES:
         convert_static_image(file_path)
     else:
         print(f"  Skipping unsupported file: {file_path}")
 
 
-def process_playlist(playlist_dir):
-    """Process all unconverted files in a playlist directory."""
-    print(f"Playlist: {os.path.basename(playlist_dir)}/")
+def process_group(file_paths, frame_format="png", threads=1):
+    """Convert a group of files in order. Runs inside a worker process.
+
+    Returns the group's log output rather than printing it, so main() can
+    show it under its playlist header instead of interleaved with the
+    other workers.
+    """
+    log = io.StringIO()
+    with redirect_stdout(log):
+        for file_path in file_paths:
+            # One bad file must not abort the run: other workers may already
+            # have converted (and removed) their sources, unlogged
+            try:
+                process_file(file_path, frame_format, threads)
+            except Exception as e:
+                print(f"  Error converting {file_path}: {e}")
+    return log.getvalue()
+
+
+def collect_playlist(playlist_dir):
+    """Scan a playlist directory and return (scan log, groups of files to convert).
+
+    Files are grouped by stem, so sources that would be written to the same
+    output name (e.g. photo.jpg and photo.bmp) are converted one after the
+    other by a single worker and get their unique_name() suffixes in sorted
+    order rather than whichever worker finishes first.
+    """
+    log = [f"Playlist: {os.path.basename(playlist_dir)}/"]
 
-    entries = sorted(os.listdir(playlist_dir))
-    found = False
+    # scandir() reports each entry's type from the directory read itself,
+    # avoiding a separate stat per entry
+    with os.scandir(playlist_dir) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    groups = {}
 
     for entry in entries:
-        full_path = os.path.join(playlist_dir, entry)
-
-        if entry.startswith("."):
+        if entry.name.startswith("."):
             continue
-        if os.path.isdir(full_path):
-            if is_converted_anim_dir(full_path):
-                print(f"  Already converted: {full_path}")
+        if entry.is_dir():
+            if is_converted_anim_dir(entry.path):
+                log.append(f"  Already converted: {entry.path}")
             continue
 
-        if Path(entry).suffix.lower() in ALL_SUPPORTED:
-            found = True
-            process_file(full_path)
+        stem, ext = os.path.splitext(entry.name)
+        if ext.lower() in ALL_SUPPORTED:
+            groups.setdefault(stem, []).append(entry.path)
+
+    if not groups:
+        log.append("  No files to convert.")
 
-    if not found:
-        print("  No files to convert.")
+    return "\n".join(log), list(groups.values())
+
+
+def positive_int(value):
+    """Parse an argparse integer option that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 
 def main():
@@ -256,6 +536,19 @@ def main():
         default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app", "media"),
         help="Path to the media directory (default: app/media)"
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="Number of files to convert in parallel (default: CPU count)"
+    )
+    parser.add_argument(
+        "--frame-format",
+        choices=FRAME_FORMATS,
+        default="png",
+        help="Image format for animation frames; jpg files are several times "
+             "smaller and faster to read on the badge (default: png)"
+    )
     args = parser.parse_args()
 
     media_dir = os.path.abspath(args.media_dir)
@@ -265,19 +558,36 @@ def main():
 
     print(f"Media directory: {media_dir}\n")
 
-    playlists = sorted(
-        entry for entry in os.listdir(media_dir)
-        if os.path.isdir(os.path.join(media_dir, entry)) and not entry.startswith(".")
-    )
+    with os.scandir(media_dir) as it:
+        playlists = sorted(
+            entry.name for entry in it
+            if entry.is_dir() and not entry.name.startswith(".")
+        )
 
     if not playlists:
         print("No playlist directories found. Create directories under media/ first.")
         print("Example: media/default/, media/furry/, media/gaming/")
         sys.exit(1)
 
-    for playlist in playlists:
-        process_playlist(os.path.join(media_dir, playlist))
-        print()
+    scans = [collect_playlist(os.path.join(media_dir, p)) for p in playlists]
+    groups = [group for _, playlist_groups in scans for group in playlist_groups]
+
+    # Cores left over by the worker processes go to threads within each GIF
+    workers = max(min(args.jobs, len(groups)), 1)
+    threads = max((os.cpu_count() or 1) // workers, 1)
+    convert = partial(process_group, frame_format=args.frame_format, threads=threads)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Every group writes to its own output names, so groups convert in
+        # parallel; map() still hands back their logs in playlist order
+        if workers > 1:
+            logs = executor.map(convert, groups)
+        else:
+            logs = map(convert, groups)
+        for scan_log, playlist_groups in scans:
+            print(scan_log)
+            for _ in playlist_groups:
+                print(next(logs), end="")
+            print()
 
     print("Done.")
 
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Prepack converted media into raw RGB565 framebuffers for the Tufty 2350.
+
+Run this after convert_media.py. For every badge-ready 320x240 image under
+app/media/ (PNGs, plus JPEG frames from --frame-format jpg), a .bin file is
+written next to it holding the raw pixels in the display's 16-bit RGB565
+layout (little-endian), so the badge can copy frames straight into memory
+instead of decoding them.
+
+Animations are delta-encoded: frame_000.bin holds the full first frame and
+every later frame is a frame_NNN.dlt listing only the byte runs that changed
+since the previous frame. Each run is an 8-byte header (little-endian uint32
+byte offset and uint32 length) followed by the new bytes, which the badge
+copies into its back buffer in place.
+
+The source images are kept: firmware that cannot load raw framebuffers
+ignores the .bin files and keeps using them. Files whose .bin is already
+up to date are skipped, so the script is safe to run repeatedly.
+
+Usage:
+    python prepack_media.py [--media-dir DIR]
+
+Examples:
+    # Prepack everything under app/media/
+    python prepack_media.py
+
+    # Specify a custom media directory
+    python prepack_media.py --media-dir /path/to/media
+"""
+
+import argparse
+import os
+import struct
+import sys
+
+from convert_media import DISPLAY_HEIGHT, DISPLAY_WIDTH, FRAME_FORMATS, Image
+
+RAW_EXT = ".bin"
+DELTA_EXT = ".dlt"
+DELTA_GAP = 8  # unchanged bytes tolerated inside a run; a run header costs 8
+
+
+def to_rgb565(img):
+    """Pack an RGB image into little-endian RGB565 bytes."""
+    data = img.convert("RGB").tobytes()
+    out = bytearray(len(data) // 3 * 2)
+    j = 0
+    for i in range(0, len(data), 3):
+        v = ((data[i] & 0xF8) << 8) | ((data[i + 1] & 0xFC) << 3) | (data[i + 2] >> 3)
+        out[j] = v & 0xFF
+        out[j + 1] = v >> 8
+        j += 2
+    return bytes(out)
+
+
+def encode_delta(prev, cur):
+    """Encode cur as the (offset, length, bytes) runs that differ from prev."""
+    out = bytearray()
+    n = len(cur)
+    i = 0
+    while i < n:
+        if prev[i] == cur[i]:
+            i += 1
+            continue
+        start = i
+        end = i + 1
+        j = end
+        while j < n and j - end < DELTA_GAP:
+            if prev[j] != cur[j]:
+                end = j + 1
+            j += 1
+        out += struct.pack("<II", start, end - start)
+        out += cur[start:end]
+        i = end
+    return bytes(out)
+
+
+def is_up_to_date(sources, outputs):
+    """Check if every output exists and is at least as new as every source."""
+    try:
+        newest_source = max(os.path.getmtime(p) for p in sources)
+        return min(os.path.getmtime(p) for p in outputs) >= newest_source
+    except (OSError, ValueError):
+        return False
+
+
+def read_frame(path):
+    """Return the RGB565 bytes for a badge-ready image, or None if it is not one."""
+    with Image.open(path) as img:
+        if img.size != (DISPLAY_WIDTH, DISPLAY_HEIGHT):
+            print(f"  Skipping (not {DISPLAY_WIDTH}x{DISPLAY_HEIGHT}, run convert_media.py): {path}")
+            return None
+        return to_rgb565(img)
+
+
+def prepack_png(png_path):
+    """Write the RGB565 .bin for a single PNG. Returns True if one was written."""
+    bin_path = os.path.splitext(png_path)[0] + RAW_EXT
+    if is_up_to_date([png_path], [bin_path]):
+        return False
+
+    data = read_frame(png_path)
+    if data is None:
+        return False
+    with open(bin_path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def prepack_anim_dir(anim_dir):
+    """Write a full first frame plus delta frames for an animation directory."""
+    frames = sorted(
+        f for f in os.listdir(anim_dir)
+        if f.startswith("frame_") and f.rpartition(".")[2] in FRAME_FORMATS
+    )
+    if not frames:
+        return
+
+    sources = [os.path.join(anim_dir, f) for f in frames]
+    stems = [os.path.splitext(p)[0] for p in sources]
+    outputs = [stems[0] + RAW_EXT] + [s + DELTA_EXT for s in stems[1:]]
+    if is_up_to_date(sources, outputs):
+        return
+
+    prev = None
+    full_size = 0
+    delta_size = 0
+    for src, stem in zip(sources, stems):
+        cur = read_frame(src)
+        if cur is None:
+            return
+        if prev is None:
+            out_path, data = stem + RAW_EXT, cur
+        else:
+            out_path, data = stem + DELTA_EXT, encode_delta(prev, cur)
+        with open(out_path, "wb") as f:
+            f.write(data)
+        full_size += len(cur)
+        delta_size += len(data)
+        prev = cur
+
+    print(f"  Prepacked {len(frames)} frames ({delta_size // 1024}KB, "
+          f"{full_size // 1024}KB without deltas): {anim_dir}")
+
+
+def prepack_playlist(playlist_dir):
+    """Prepack every image and animation in a playlist directory."""
+    print(f"Playlist: {os.path.basename(playlist_dir)}/")
+
+    with os.scandir(playlist_dir) as it:
+        entries = sorted(it, key=lambda e: e.name)
+
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        if entry.is_dir():
+            prepack_anim_dir(entry.path)
+        elif entry.name.lower().endswith(".png") and prepack_png(entry.path):
+            print(f"  Prepacked: {entry.path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prepack converted media as raw RGB565 for Badgeware Slideshow (Tufty 2350)"
+    )
+    parser.add_argument(
+        "--media-dir",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app", "media"),
+        help="Path to the media directory (default: app/media)"
+    )
+    args = parser.parse_args()
+
+    media_dir = os.path.abspath(args.media_dir)
+    if not os.path.isdir(media_dir):
+        print(f"Error: Media directory not found: {media_dir}")
+        sys.exit(1)
+
+    print(f"Media directory: {media_dir}\n")
+
+    with os.scandir(media_dir) as it:
+        playlists = sorted(
+            entry.name for entry in it
+            if entry.is_dir() and not entry.name.startswith(".")
+        )
+
+    for playlist in playlists:
+        prepack_playlist(os.path.join(media_dir, playlist))
+        print()
+
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()